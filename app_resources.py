@@ -0,0 +1,35 @@
+import streamlit as st
+
+from exam_registry import ExamRegistry
+
+# Process-wide singletons for the student app. They live in an imported module
+# rather than in student_app.py because Streamlit re-executes the script on every
+# rerun, and re-applying st.cache_resource there re-hashes the functions' source
+# each time.
+
+HTTP_POOL_SIZE = 64  # Connections kept open to GitHub across all sessions
+
+
+@st.cache_resource
+def get_http_session():
+    """Process-wide HTTP session, created on the first GitHub call"""
+    # Imported lazily so a cold start that never touches the network skips it
+    import requests
+    from http.cookiejar import DefaultCookiePolicy
+    from requests.adapters import HTTPAdapter
+
+    # Every script thread shares this session, so it must hold no per-user state:
+    # auth headers are passed per request and cookies are never stored. Size the
+    # connection pool for an exam hall and make threads wait for a free connection
+    # rather than open throwaway ones.
+    session = requests.Session()
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=HTTP_POOL_SIZE, pool_block=True)
+    session.mount("https://", adapter)
+    return session
+
+
+@st.cache_resource
+def get_exam_registry():
+    """Process-wide registry of shared tests for exam hall mode"""
+    return ExamRegistry()
@@ -0,0 +1,147 @@
+"""Measure the student app's per-rerun overhead with streamlit's AppTest.
+
+Streamlit re-executes student_app.py on every interaction, so the time spent in
+the script body on each rerun is overhead every student pays. The app runs under
+AppTest, and a small wrapper script times only the execution of the app's code
+(compiled once, as Streamlit caches script bytecode), leaving out AppTest's own
+bookkeeping. The median exam-page rerun is checked against RERUN_BUDGET_MS.
+Pass --before <git rev> to time the app as of that revision too.
+
+Run with: python bench_rerun.py [--before <git rev>]
+"""
+import argparse
+import builtins
+import os
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+RERUN_BUDGET_MS = 50  # Allowed median script time of an exam-page rerun
+RERUNS = 40
+QUESTIONS = 20
+APP_FILE = "student_app.py"
+WRAPPER_FILE = "_bench_rerun_wrapper.py"
+
+# Runs the app's code object and records how long it took in this script thread
+WRAPPER_SOURCE = '''import builtins, time
+started = time.perf_counter()
+try:
+    exec(builtins._bench_code, {"__name__": "__main__", "__file__": builtins._bench_file})
+finally:
+    builtins._bench_timings.append((time.perf_counter() - started) * 1000)
+'''
+
+
+def sample_test():
+    """A test with enough questions to make the exam page realistic"""
+    return {
+        "subject": "Physics",
+        "teacher_name": "Bench",
+        "topics": ["Optics"],
+        "difficulty": "Medium",
+        "created_at": "2025-01-05T10:00:00",
+        "exam_duration_minutes": 60,
+        "questions": [
+            {
+                "question_text": f"Question {n} about lenses?",
+                "options": {"A": "One", "B": "Two", "C": "Three", "D": "Four"},
+                "correct_answer": "A",
+                "explanation": "Because.",
+                "topic": "Optics"
+            }
+            for n in range(1, QUESTIONS + 1)
+        ]
+    }
+
+
+def start_page(app_test):
+    """Student information form, before a test is loaded"""
+
+
+def exam_page(app_test):
+    """A started test with the timer running"""
+    app_test.session_state.test_loaded = True
+    app_test.session_state.test_data = sample_test()
+    app_test.session_state.student_info = {
+        "name": "Bench Student",
+        "email": "",
+        "student_id": "",
+        "test_id": "BENCH_20250105_01",
+        "student_token": "unused"
+    }
+    app_test.session_state.test_started = True
+    app_test.session_state.start_time = datetime.now()
+
+
+SCENARIOS = (("start page", start_page), ("exam page", exam_page))
+
+
+def app_source(revision):
+    """Source of the app in the working tree, or as of a git revision"""
+    if revision is None:
+        with open(APP_FILE) as f:
+            return f.read()
+    return subprocess.run(
+        ["git", "show", f"{revision}:{APP_FILE}"], capture_output=True, text=True, check=True
+    ).stdout
+
+
+def rerun_ms(source, setup):
+    """Median script time of a rerun of the app in one scenario"""
+    from streamlit.testing.v1 import AppTest
+
+    builtins._bench_code = compile(source, APP_FILE, "exec")
+    builtins._bench_file = os.path.abspath(APP_FILE)
+    builtins._bench_timings = []
+
+    app_test = AppTest.from_file(WRAPPER_FILE, default_timeout=30)
+    setup(app_test)
+    app_test.run()  # First run pays the imports
+    if app_test.exception:
+        raise RuntimeError(f"App failed: {app_test.exception[0].value}")
+
+    del builtins._bench_timings[:]
+    for _ in range(RERUNS):
+        app_test.run()
+    return statistics.median(builtins._bench_timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--before", help="git revision of student_app.py to compare against")
+    args = parser.parse_args()
+
+    try:
+        import streamlit.testing.v1  # noqa: F401
+    except ImportError:
+        print("streamlit is not installed: skipping rerun benchmark")
+        return
+
+    apps = [("after", app_source(None))]
+    if args.before:
+        apps.insert(0, (f"before ({args.before})", app_source(args.before)))
+
+    with open(WRAPPER_FILE, "w") as f:
+        f.write(WRAPPER_SOURCE)
+    try:
+        results = {}
+        print(f"Median script time per rerun over {RERUNS} reruns")
+        for scenario, setup in SCENARIOS:
+            for label, source in apps:
+                results[scenario, label] = rerun_ms(source, setup)
+                print(f"  {scenario:<11} {label:<20} {results[scenario, label]:7.2f} ms")
+    finally:
+        os.remove(WRAPPER_FILE)
+
+    exam_ms = results["exam page", "after"]
+    print(f"Budget: exam page rerun {exam_ms:.2f} ms of {RERUN_BUDGET_MS} ms")
+    if exam_ms > RERUN_BUDGET_MS:
+        print("❌ Per-rerun budget exceeded")
+        sys.exit(1)
+    print("✅ Within budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+from datetime import datetime
+
+from syllabus import syllabus
+
+# Student profile configuration
+PROFILE_VERSION = 2
+MASTERY_ALPHA = 0.3  # Weight of one answered question in the running mastery score
+MASTERY_PRIOR = 40.0  # Starting mastery (%) of a new topic, below the weak threshold
+TREND_LENGTH = 10  # Number of past per-attempt scores kept for each topic
+WEAK_TOPIC_THRESHOLD = 60.0  # Mastery (%) below which a topic is reported as weak
+RECENT_ATTEMPTS = 20  # Number of applied attempt IDs remembered for deduplication
+
+# Positions inside a compact topic entry: [attempted, correct, mastery, trend, last_seen]
+# Entries live under profile["subjects"][subject]["topics"]
+ATTEMPTED, CORRECT, MASTERY, TREND, LAST_SEEN = range(5)
+
+
+def new_profile(student_key):
+    """Create an empty longitudinal profile for a student"""
+    return {
+        "version": PROFILE_VERSION,
+        "student": student_key,
+        "attempts": 0,
+        "updated_at": None,
+        "recent_attempts": [],
+        "subjects": {}
+    }
+
+
+def upgrade_profile(profile):
+    """Bring a stored profile up to the current layout"""
+    if profile.get("version", 1) < 2:
+        # Version 1 kept topics directly under each subject and counted attempts
+        # across subjects; estimate each subject's count from its longest trend
+        for subject, topics in profile["subjects"].items():
+            attempts = max((len(entry[TREND]) for entry in topics.values()), default=0)
+            profile["subjects"][subject] = {"attempts": attempts, "topics": topics}
+        profile["version"] = 2
+    return profile
+
+
+def match_syllabus_topic(subject, topic):
+    """Map a question topic onto the matching syllabus topic name, if any"""
+    subject_topics = syllabus.get(subject, {})
+    if topic in subject_topics:
+        return topic
+    wanted = topic.strip().lower()
+    for name in subject_topics:
+        if name.lower() == wanted:
+            return name
+    return topic
+
+
+def update_profile(profile, subject, score_data, completed_at=None, attempt_id=None):
+    """Fold one submission into the profile in a single pass over its results
+
+    Each question answered moves a topic's mastery towards this attempt's score
+    by MASTERY_ALPHA, so a ten-question attempt outweighs a one-question one.
+    Returns False without changing the profile if the attempt was already applied.
+    """
+    upgrade_profile(profile)
+    recent_attempts = profile.setdefault("recent_attempts", [])
+    if attempt_id is not None:
+        if attempt_id in recent_attempts:
+            return False
+        recent_attempts.append(attempt_id)
+        del recent_attempts[:-RECENT_ATTEMPTS]
+
+    completed_at = completed_at or datetime.now().isoformat()
+    subject_record = profile["subjects"].setdefault(subject, {"attempts": 0, "topics": {}})
+    subject_topics = subject_record["topics"]
+
+    # Tally this attempt per topic
+    tally = {}
+    for result in score_data['results']:
+        topic = match_syllabus_topic(subject, result.get('topic', 'General'))
+        counts = tally.setdefault(topic, [0, 0])
+        counts[0] += 1
+        if result['is_correct']:
+            counts[1] += 1
+
+    # Merge the tally into the stored running scores
+    for topic, (attempted, correct) in tally.items():
+        attempt_score = round(correct / attempted * 100, 1)
+        entry = subject_topics.get(topic)
+        if entry is None:
+            entry = [0, 0, MASTERY_PRIOR, [], None]
+            subject_topics[topic] = entry
+        alpha = 1 - (1 - MASTERY_ALPHA) ** attempted
+        entry[MASTERY] = round(alpha * attempt_score + (1 - alpha) * entry[MASTERY], 1)
+        entry[ATTEMPTED] += attempted
+        entry[CORRECT] += correct
+        entry[TREND] = (entry[TREND] + [attempt_score])[-TREND_LENGTH:]
+        entry[LAST_SEEN] = completed_at
+
+    subject_record["attempts"] += 1
+    profile["attempts"] += 1
+    profile["updated_at"] = completed_at
+    return True
+
+
+def weak_topics_report(profile, subject, threshold=WEAK_TOPIC_THRESHOLD):
+    """Build a weak-topics report for a subject from the student's profile"""
+    upgrade_profile(profile)
+    subject_record = profile["subjects"].get(subject, {"attempts": 0, "topics": {}})
+    subject_topics = subject_record["topics"]
+    syllabus_topics = syllabus.get(subject, {})
+
+    weak_topics = []
+    strong_topics = []
+    for topic, entry in subject_topics.items():
+        trend = entry[TREND]
+        item = {
+            "topic": topic,
+            "mastery": entry[MASTERY],
+            "attempted": entry[ATTEMPTED],
+            "correct": entry[CORRECT],
+            "trend": trend[-1] - trend[-2] if len(trend) > 1 else 0.0,
+            "description": syllabus_topics.get(topic, {}).get('description', '')
+        }
+        if entry[MASTERY] < threshold:
+            weak_topics.append(item)
+        else:
+            strong_topics.append(item)
+
+    weak_topics.sort(key=lambda item: item['mastery'])
+    strong_topics.sort(key=lambda item: item['mastery'], reverse=True)
+
+    return {
+        "subject": subject,
+        "threshold": threshold,
+        "attempts": subject_record["attempts"],
+        "weak_topics": weak_topics,
+        "strong_topics": strong_topics,
+        "untested_topics": [t for t in syllabus_topics if t not in subject_topics]
+    }
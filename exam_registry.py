@@ -0,0 +1,100 @@
+import threading
+import time
+from types import MappingProxyType
+
+# Exam hall configuration
+EXAM_WINDOW_GRACE_MINUTES = 15  # Time after the exam duration before a test may be evicted
+STALE_SESSION_MINUTES = 120  # Time after the window closes before abandoned sessions are ignored
+
+
+def freeze(value):
+    """Return a read-only copy of decoded JSON that can be shared across sessions"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+class ExamRegistry:
+    """Process-wide store of loaded tests, shared by every session taking them
+
+    Each entry holds one frozen copy of a test, the sessions holding it, and
+    the time its exam window closes: the exam duration plus a grace period,
+    counted from when the test was first loaded. Entries are evicted once the
+    window has closed and no session holds them, or once abandoned sessions
+    are long past the window.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._loading = {}
+
+    def acquire(self, test_id, holder_id, loader, authorize):
+        """Return the shared test for a session, loading it on first use
+
+        ``loader`` and ``authorize`` follow the app's ``(success, data)``
+        convention. The first session to ask for a test calls ``loader``, which
+        fetches it with that session's credentials; sessions asking meanwhile
+        wait for that fetch. Every later session must pass ``authorize`` before
+        it is handed the shared copy.
+        """
+        while True:
+            with self._lock:
+                self._evict_closed(time.time())
+                entry = self._entries.get(test_id)
+                pending = self._loading.get(test_id)
+                if entry is None and pending is None:
+                    # This session fetches the test
+                    pending = threading.Event()
+                    self._loading[test_id] = pending
+                    break
+
+            if entry is not None:
+                success, message = authorize()
+                if not success:
+                    return False, message
+                with self._lock:
+                    entry["holders"].add(holder_id)
+                return True, entry["test"]
+
+            # Another session is fetching the test: wait, then look again
+            pending.wait()
+
+        try:
+            success, test_data = loader()
+            if success:
+                duration = test_data.get('exam_duration_minutes', 60) + EXAM_WINDOW_GRACE_MINUTES
+                entry = {
+                    "test": freeze(test_data),
+                    "holders": {holder_id},
+                    "closes_at": time.time() + duration * 60
+                }
+                with self._lock:
+                    self._entries[test_id] = entry
+                return True, entry["test"]
+            return False, test_data
+        finally:
+            with self._lock:
+                del self._loading[test_id]
+            pending.set()
+
+    def release(self, test_id, holder_id):
+        """Drop a session's hold on a test; unknown holders are ignored"""
+        with self._lock:
+            entry = self._entries.get(test_id)
+            if entry is not None:
+                entry["holders"].discard(holder_id)
+            self._evict_closed(time.time())
+
+    def stats(self):
+        """Return (test_id, sessions) for every registered test"""
+        with self._lock:
+            return [(test_id, len(entry["holders"])) for test_id, entry in self._entries.items()]
+
+    def _evict_closed(self, now):
+        stale_after = STALE_SESSION_MINUTES * 60
+        for test_id, entry in list(self._entries.items()):
+            if now >= entry["closes_at"] and (not entry["holders"] or now >= entry["closes_at"] + stale_after):
+                del self._entries[test_id]
@@ -0,0 +1,137 @@
+import math
+import os
+import sys
+
+# Item analysis configuration
+MIN_RESPONSES = 10  # Responses needed before an item can be flagged
+TOO_EASY_P_VALUE = 0.9  # Share correct above which an item is too easy
+TOO_HARD_P_VALUE = 0.2  # Share correct below which an item is too hard
+RECENT_ATTEMPTS = 50  # Number of applied attempt IDs remembered for deduplication
+
+# Positions inside a compact item entry:
+# [responses, mean correct, mean rest score, M2 correct, M2 rest score, co-moment, option counts]
+N, MEAN_X, MEAN_Y, M2_X, M2_Y, C_XY, OPTIONS = range(7)
+
+
+def new_item_stats(test_id):
+    """Create empty running item statistics for a test"""
+    return {
+        "test_id": test_id,
+        "submissions": 0,
+        "recent_attempts": [],
+        "items": {}
+    }
+
+
+def update_item_stats(stats, score_data, attempt_id=None):
+    """Fold one submission into the running statistics of every item it answers
+
+    Uses Welford-style updates of the means, variances and co-moment of item
+    correctness against the rest score: the share of the other questions answered
+    correctly, so an item is not correlated with its own answer. Returns False
+    without changing the statistics if the attempt was already applied.
+    """
+    recent_attempts = stats["recent_attempts"]
+    if attempt_id is not None:
+        if attempt_id in recent_attempts:
+            return False
+        recent_attempts.append(attempt_id)
+        del recent_attempts[:-RECENT_ATTEMPTS]
+
+    correct_answers = score_data['correct_answers']
+    other_questions = max(score_data['total_questions'] - 1, 1)
+    for result in score_data['results']:
+        key = str(result['question_number'])
+        entry = stats["items"].get(key)
+        if entry is None:
+            entry = [0, 0.0, 0.0, 0.0, 0.0, 0.0, {}]
+            stats["items"][key] = entry
+
+        correct = 1.0 if result['is_correct'] else 0.0
+        rest_score = (correct_answers - correct) / other_questions
+        entry[N] += 1
+        dx = correct - entry[MEAN_X]
+        dy = rest_score - entry[MEAN_Y]
+        entry[MEAN_X] += dx / entry[N]
+        entry[MEAN_Y] += dy / entry[N]
+        entry[M2_X] += dx * (correct - entry[MEAN_X])
+        entry[M2_Y] += dy * (rest_score - entry[MEAN_Y])
+        entry[C_XY] += dx * (rest_score - entry[MEAN_Y])
+
+        option = result['student_answer'] or "-"
+        entry[OPTIONS][option] = entry[OPTIONS].get(option, 0) + 1
+
+    stats["submissions"] += 1
+    return True
+
+
+def point_biserial(entry):
+    """Correlation between answering the item correctly and the rest score"""
+    if entry[M2_X] <= 0 or entry[M2_Y] <= 0:
+        return None
+    return entry[C_XY] / math.sqrt(entry[M2_X] * entry[M2_Y])
+
+
+def item_report(stats):
+    """Summarize every item with its p-value, discrimination and flags"""
+    report = []
+    for key, entry in sorted(stats["items"].items(), key=lambda item: int(item[0])):
+        p_value = entry[MEAN_X]
+        discrimination = point_biserial(entry)
+
+        flags = []
+        if entry[N] >= MIN_RESPONSES:
+            if p_value > TOO_EASY_P_VALUE:
+                flags.append("too_easy")
+            elif p_value < TOO_HARD_P_VALUE:
+                flags.append("too_hard")
+            if discrimination is not None and discrimination < 0:
+                flags.append("negative_discrimination")
+
+        report.append({
+            "question_number": int(key),
+            "responses": entry[N],
+            "p_value": round(p_value, 3),
+            "point_biserial": round(discrimination, 3) if discrimination is not None else None,
+            "option_counts": dict(entry[OPTIONS]),
+            "flags": flags
+        })
+    return report
+
+
+def reusable_questions(questions, stats):
+    """Return the questions of a test that were not flagged by item analysis"""
+    flagged = {item['question_number'] for item in item_report(stats) if item['flags']}
+    return [
+        question for i, question in enumerate(questions)
+        if question.get('question_number', i + 1) not in flagged
+    ]
+
+
+def main():
+    """Print the item report for a test: python item_analysis.py <test_id>"""
+    if len(sys.argv) != 2:
+        print("Usage: GITHUB_TOKEN=<token> python item_analysis.py <test_id>")
+        sys.exit(2)
+    test_id = sys.argv[1]
+
+    # Reuse the app's GitHub loader so the file location and format stay in one place
+    from student_app import load_item_stats_from_github
+
+    success, loaded = load_item_stats_from_github(test_id, os.environ.get("GITHUB_TOKEN", ""))
+    if not success:
+        print(loaded)
+        sys.exit(1)
+    stats, _ = loaded
+
+    print(f"Item analysis for {test_id} ({stats['submissions']} submissions)")
+    print(f"{'Q':>3}  {'N':>5}  {'p':>6}  {'r_pb':>6}  {'options':<28}  flags")
+    for item in item_report(stats):
+        r_pb = f"{item['point_biserial']:.3f}" if item['point_biserial'] is not None else "-"
+        options = " ".join(f"{option}:{count}" for option, count in sorted(item['option_counts'].items()))
+        print(f"{item['question_number']:>3}  {item['responses']:>5}  {item['p_value']:>6.3f}  "
+              f"{r_pb:>6}  {options:<28}  {', '.join(item['flags'])}")
+
+
+if __name__ == "__main__":
+    main()
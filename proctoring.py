@@ -0,0 +1,113 @@
+import json
+import time
+from collections import deque
+
+# Proctoring event configuration
+EVENT_BUFFER_SIZE = 256  # Events held in memory per attempt; oldest are dropped beyond this
+FLUSH_BATCH_SIZE = 64  # Events written to storage per batch
+FLUSH_RETRY_SECONDS = 30  # Time after a failed write before a routine flush is tried again
+
+# Event types
+EVENT_START = "start"
+EVENT_ANSWER = "answer"
+EVENT_SUBMIT = "submit"
+EVENT_TIMEOUT = "timeout"
+
+
+def new_event_log(attempt_id):
+    """Create the in-session event buffer for a test attempt"""
+    return {
+        "attempt_id": attempt_id,
+        "started": time.time(),
+        "events": deque(maxlen=EVENT_BUFFER_SIZE),
+        "next_batch": 0,
+        "last_failed_flush": None,
+        "recorded": 0,
+        "dropped": 0
+    }
+
+
+def record_event(event_log, event_type, question_num=None, value=None):
+    """Append a compact [elapsed_ms, type, question, value] event to the buffer"""
+    events = event_log["events"]
+    if len(events) == events.maxlen:
+        # Storage has been unreachable long enough to fill the buffer
+        event_log["dropped"] += 1
+    elapsed_ms = int((time.time() - event_log["started"]) * 1000)
+    events.append([elapsed_ms, event_type, question_num, value])
+    event_log["recorded"] += 1
+
+
+def event_buffer_counts(event_log):
+    """Events recorded for an attempt and how many overflowed the buffer unwritten"""
+    return {"recorded": event_log["recorded"], "dropped": event_log["dropped"]}
+
+
+def flush_due(event_log, now=None):
+    """Whether enough events are buffered to write a batch and no recent write failed"""
+    if len(event_log["events"]) < FLUSH_BATCH_SIZE:
+        return False
+    last_failed = event_log.get("last_failed_flush")
+    if last_failed is None:
+        return True
+    now = time.time() if now is None else now
+    return now - last_failed >= FLUSH_RETRY_SECONDS
+
+
+def mark_flush_failed(event_log, now=None):
+    """Record a failed write so routine flushes back off for a while"""
+    event_log["last_failed_flush"] = time.time() if now is None else now
+
+
+def pending_batch(event_log):
+    """Return (batch number, JSON lines) for the oldest buffered events, or None"""
+    events = event_log["events"]
+    if not events:
+        return None
+    count = min(len(events), FLUSH_BATCH_SIZE)
+    lines = "\n".join(json.dumps(events[i], separators=(',', ':')) for i in range(count))
+    return event_log["next_batch"], lines + "\n"
+
+
+def mark_batch_written(event_log):
+    """Drop the events of the batch just written from the buffer"""
+    events = event_log["events"]
+    for _ in range(min(len(events), FLUSH_BATCH_SIZE)):
+        events.popleft()
+    event_log["next_batch"] += 1
+    event_log["last_failed_flush"] = None
+
+
+def iter_batch_events(content):
+    """Yield events from one stored batch, one line at a time"""
+    for line in content.splitlines():
+        if line:
+            yield json.loads(line)
+
+
+def summarize_events(events):
+    """Single-pass summary of an event stream for reviewing an attempt"""
+    summary = {
+        "events": 0,
+        "answer_changes": 0,
+        "questions_changed_repeatedly": set(),
+        "longest_gap_seconds": 0.0,
+        "submitted_at_seconds": None
+    }
+    changes_per_question = {}
+    last_elapsed_ms = 0
+    for elapsed_ms, event_type, question_num, value in events:
+        summary["events"] += 1
+        summary["longest_gap_seconds"] = max(
+            summary["longest_gap_seconds"], (elapsed_ms - last_elapsed_ms) / 1000
+        )
+        last_elapsed_ms = elapsed_ms
+        if event_type == EVENT_ANSWER:
+            summary["answer_changes"] += 1
+            changes_per_question[question_num] = changes_per_question.get(question_num, 0) + 1
+            if changes_per_question[question_num] > 2:
+                summary["questions_changed_repeatedly"].add(question_num)
+        elif event_type in (EVENT_SUBMIT, EVENT_TIMEOUT):
+            summary["submitted_at_seconds"] = elapsed_ms / 1000
+    summary["questions_changed_repeatedly"] = sorted(summary["questions_changed_repeatedly"])
+    return summary
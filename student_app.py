@@ -1,15 +1,49 @@
 import streamlit as st
 import json
-import requests
 import base64
+import hashlib
+import random
 import time
+import uuid
 from datetime import datetime, timedelta
 import os
 
+from app_resources import get_exam_registry, get_http_session
+from diagnostics import new_profile, update_profile, weak_topics_report
+from item_analysis import new_item_stats, update_item_stats
+from proctoring import (
+    EVENT_ANSWER, EVENT_START, EVENT_SUBMIT, EVENT_TIMEOUT,
+    event_buffer_counts, flush_due, iter_batch_events, mark_batch_written, mark_flush_failed, new_event_log,
+    pending_batch, record_event
+)
+from templates import HOW_TO_TAKE_TEST_MD, render_timer
+
 # GitHub configuration
 GITHUB_REPO = "IshantWadhwa4/data_tsmcq"
 GITHUB_PATH = "questions"  # Path where test files are stored
 RESULTS_PATH = "students_solution"  # Path where student results will be stored
+PROFILES_PATH = "student_profiles"  # Path where longitudinal student profiles are stored
+PROCTORING_PATH = "proctoring_events"  # Path where per-attempt event batches are stored
+ITEM_STATS_PATH = "item_stats"  # Path where running per-question statistics are stored
+
+# Exam hall mode: sessions share one in-memory copy of each test
+EXAM_HALL_MODE = os.environ.get("EXAM_HALL_MODE") == "1"
+
+# GitHub request timeout
+HTTP_TIMEOUT_SECONDS = 20
+
+# Result upload retries
+SAVE_RETRIES = 4
+SAVE_RETRY_BACKOFF_SECONDS = 0.5
+RETRY_STATUS_CODES = (409, 429, 500, 502, 503, 504)
+
+# Read-modify-write retries for files submissions update concurrently (item statistics, profiles)
+DERIVED_UPDATE_BUDGET_SECONDS = 10  # Wall-clock limit for all derived updates after a submit
+MIN_REQUEST_SECONDS = 1  # Give up rather than start a request with less time than this left
+UPDATE_RETRIES = 15
+UPDATE_BACKOFF_SECONDS = 0.25
+UPDATE_BACKOFF_CAP_SECONDS = 4
+SAVE_CONFLICT = "conflict"  # Message returned when a file changed since it was loaded
 
 def load_test_from_github(test_id, student_token):
     """Load test data from GitHub repository"""
@@ -24,7 +58,7 @@ def load_test_from_github(test_id, student_token):
         }
         
         # Make the request
-        response = requests.get(url, headers=headers)
+        response = get_http_session().get(url, headers=headers, timeout=HTTP_TIMEOUT_SECONDS)
         
         if response.status_code == 200:
             file_data = response.json()
@@ -37,43 +71,458 @@ def load_test_from_github(test_id, student_token):
     except Exception as e:
         return False, f"Error loading test: {str(e)}"
 
+def check_test_access(test_id, student_token):
+    """Check that a token can read a test without downloading it"""
+    try:
+        url = f"https://api.github.com/repos/{GITHUB_REPO}/contents/{GITHUB_PATH}/{test_id}.json"
+        
+        headers = {
+            "Authorization": f"token {student_token}",
+            "Accept": "application/vnd.github.v3+json"
+        }
+        
+        response = get_http_session().head(url, headers=headers, timeout=HTTP_TIMEOUT_SECONDS)
+        
+        if response.status_code == 200:
+            return True, "Access granted"
+        else:
+            return False, f"Test not found: {response.status_code}"
+    
+    except Exception as e:
+        return False, f"Error loading test: {str(e)}"
+
+def submission_hash(result_data):
+    """Content hash over the parts of a submission that identify it"""
+    # Timestamps are left out so a manual and an auto submit of the same answers match
+    payload = {
+        "attempt_id": result_data['attempt_id'],
+        "test_id": result_data['test_id'],
+        "student_name": result_data['student_name'],
+        "answers": [result['student_answer'] for result in result_data['score']['results']]
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
 def save_student_result_to_github(result_data, student_name, test_id, student_token):
-    """Save student result to GitHub repository"""
+    """Save student result to GitHub repository, idempotently per attempt"""
+    # One file per attempt, so retries and duplicate submits hit the same path
+    filename = f"{student_name}_{test_id}_{result_data['attempt_id']}.json"
+    
+    # GitHub API endpoint
+    url = f"https://api.github.com/repos/{GITHUB_REPO}/contents/{RESULTS_PATH}/{filename}"
+    
+    # Prepare the content
+    content = json.dumps(result_data, indent=2)
+    encoded_content = base64.b64encode(content.encode()).decode()
+    
+    # API request data
+    data = {
+        "message": f"Add student result: {student_name} - {test_id}",
+        "content": encoded_content,
+        "branch": "main"  # or your default branch
+    }
+    
+    # Headers
+    headers = {
+        "Authorization": f"token {student_token}",
+        "Accept": "application/vnd.github.v3+json"
+    }
+    
+    message = "Error saving results: no attempt made"
+    for attempt in range(SAVE_RETRIES):
+        if attempt:
+            time.sleep(SAVE_RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1))
+        try:
+            response = get_http_session().put(url, json=data, headers=headers, timeout=HTTP_TIMEOUT_SECONDS)
+            
+            if response.status_code == 201:
+                return True, "Results successfully saved to GitHub"
+            elif response.status_code == 422:
+                # Only an existing attempt file makes this a duplicate; any other 422 is final
+                existing = get_http_session().get(url, headers=headers, timeout=HTTP_TIMEOUT_SECONDS)
+                if existing.status_code != 200:
+                    return False, f"Error saving results: {response.status_code} - {response.text}"
+                stored = json.loads(base64.b64decode(existing.json()['content']).decode())
+                if stored.get('content_hash') == result_data['content_hash']:
+                    return True, "Results already saved to GitHub"
+                return False, "A different submission for this attempt is already saved"
+            elif response.status_code in RETRY_STATUS_CODES:
+                message = f"Error saving results: {response.status_code} - {response.text}"
+            else:
+                return False, f"Error saving results: {response.status_code} - {response.text}"
+        
+        except Exception as e:
+            message = f"Error saving results: {str(e)}"
+    
+    return False, message
+
+def load_student_profile_from_github(student_key, student_token, timeout=HTTP_TIMEOUT_SECONDS):
+    """Load a student's profile and its blob SHA from GitHub"""
     try:
-        # Create filename with timestamp
-        timestamp = int(time.time())
-        filename = f"{student_name}_{test_id}_{timestamp}.json"
+        url = f"https://api.github.com/repos/{GITHUB_REPO}/contents/{PROFILES_PATH}/{student_key}.json"
         
-        # GitHub API endpoint
-        url = f"https://api.github.com/repos/{GITHUB_REPO}/contents/{RESULTS_PATH}/{filename}"
+        headers = {
+            "Authorization": f"token {student_token}",
+            "Accept": "application/vnd.github.v3+json"
+        }
+        
+        response = get_http_session().get(url, headers=headers, timeout=timeout)
+        
+        if response.status_code == 200:
+            file_data = response.json()
+            content = base64.b64decode(file_data['content']).decode()
+            return True, (json.loads(content), file_data['sha'])
+        elif response.status_code == 404:
+            # First submission for this student
+            return True, (new_profile(student_key), None)
+        else:
+            return False, f"Error loading profile: {response.status_code}"
+    
+    except Exception as e:
+        return False, f"Error loading profile: {str(e)}"
+
+def save_student_profile_to_github(profile, student_key, sha, student_token, timeout=HTTP_TIMEOUT_SECONDS):
+    """Create or update a student's profile on GitHub"""
+    try:
+        url = f"https://api.github.com/repos/{GITHUB_REPO}/contents/{PROFILES_PATH}/{student_key}.json"
         
-        # Prepare the content
-        content = json.dumps(result_data, indent=2)
+        # Compact encoding keeps the profile small however many tests are taken
+        content = json.dumps(profile, separators=(',', ':'))
         encoded_content = base64.b64encode(content.encode()).decode()
         
-        # API request data
         data = {
-            "message": f"Add student result: {student_name} - {test_id}",
+            "message": f"Update student profile: {student_key}",
             "content": encoded_content,
-            "branch": "main"  # or your default branch
+            "branch": "main"
         }
+        if sha:
+            data["sha"] = sha
         
-        # Headers
         headers = {
             "Authorization": f"token {student_token}",
             "Accept": "application/vnd.github.v3+json"
         }
         
-        # Make the request
-        response = requests.put(url, json=data, headers=headers)
+        response = get_http_session().put(url, json=data, headers=headers, timeout=timeout)
+        
+        if response.status_code in (200, 201):
+            return True, "Profile successfully saved to GitHub"
+        elif response.status_code in (409, 422):
+            return False, SAVE_CONFLICT
+        else:
+            return False, f"Error saving profile: {response.status_code} - {response.text}"
+    
+    except Exception as e:
+        return False, f"Error saving profile: {str(e)}"
+
+def student_profile_key(student_info):
+    """Profile file name for a student, or None when there is no Student ID to tell namesakes apart"""
+    if not student_info['student_id']:
+        return None
+    return f"{student_info['name']}_{student_info['student_id']}".replace(' ', '_')
+
+def update_student_diagnostics(student_info, subject, score_data, completed_at, attempt_id, deadline):
+    """Fold a submission into the student's profile and build the weak-topics report
+    
+    Returns (success, message, report).
+    """
+    student_key = student_profile_key(student_info)
+    if student_key is None:
+        # Without a stable key only this attempt can be reported on
+        profile = new_profile(student_info['name'])
+        update_profile(profile, subject, score_data, completed_at, attempt_id)
+        message = "enter a Student ID to track topics across tests"
+        return False, message, weak_topics_report(profile, subject)
+    
+    latest = {}
+    
+    def apply(profile):
+        latest['profile'] = profile
+        return update_profile(profile, subject, score_data, completed_at, attempt_id)
+    
+    success, message = update_file_with_retries(
+        lambda timeout: load_student_profile_from_github(student_key, student_info['student_token'], timeout),
+        apply,
+        lambda profile, sha, timeout: save_student_profile_to_github(
+            profile, student_key, sha, student_info['student_token'], timeout
+        ),
+        deadline
+    )
+    
+    if 'profile' not in latest:
+        # Still report on this attempt even if the stored profile is unavailable
+        latest['profile'] = new_profile(student_key)
+        update_profile(latest['profile'], subject, score_data, completed_at, attempt_id)
+    
+    return success, message, weak_topics_report(latest['profile'], subject)
+
+def load_item_stats_from_github(test_id, student_token, timeout=HTTP_TIMEOUT_SECONDS):
+    """Load a test's running item statistics and their blob SHA from GitHub"""
+    try:
+        url = f"https://api.github.com/repos/{GITHUB_REPO}/contents/{ITEM_STATS_PATH}/{test_id}.json"
+        
+        headers = {
+            "Authorization": f"token {student_token}",
+            "Accept": "application/vnd.github.v3+json"
+        }
+        
+        response = get_http_session().get(url, headers=headers, timeout=timeout)
+        
+        if response.status_code == 200:
+            file_data = response.json()
+            content = base64.b64decode(file_data['content']).decode()
+            return True, (json.loads(content), file_data['sha'])
+        elif response.status_code == 404:
+            # First submission for this test
+            return True, (new_item_stats(test_id), None)
+        else:
+            return False, f"Error loading item statistics: {response.status_code}"
+    
+    except Exception as e:
+        return False, f"Error loading item statistics: {str(e)}"
+
+def save_item_stats_to_github(stats, test_id, sha, student_token, timeout=HTTP_TIMEOUT_SECONDS):
+    """Create or update a test's item statistics on GitHub"""
+    try:
+        url = f"https://api.github.com/repos/{GITHUB_REPO}/contents/{ITEM_STATS_PATH}/{test_id}.json"
+        
+        content = json.dumps(stats, separators=(',', ':'))
+        encoded_content = base64.b64encode(content.encode()).decode()
+        
+        data = {
+            "message": f"Update item statistics: {test_id}",
+            "content": encoded_content,
+            "branch": "main"
+        }
+        if sha:
+            data["sha"] = sha
+        
+        headers = {
+            "Authorization": f"token {student_token}",
+            "Accept": "application/vnd.github.v3+json"
+        }
+        
+        response = get_http_session().put(url, json=data, headers=headers, timeout=timeout)
+        
+        if response.status_code in (200, 201):
+            return True, "Item statistics successfully saved to GitHub"
+        elif response.status_code in (409, 422):
+            return False, SAVE_CONFLICT
+        else:
+            return False, f"Error saving item statistics: {response.status_code} - {response.text}"
+    
+    except Exception as e:
+        return False, f"Error saving item statistics: {str(e)}"
+
+def update_retry_delay(attempt):
+    """Jittered exponential backoff so concurrent writers spread out instead of colliding again"""
+    return random.uniform(0, min(UPDATE_BACKOFF_CAP_SECONDS, UPDATE_BACKOFF_SECONDS * 2 ** attempt))
+
+def update_file_with_retries(load, apply, save, deadline):
+    """Read-modify-write a shared GitHub file, reloading and reapplying on concurrent writes
+    
+    ``load`` and ``save`` take the request timeout as their last argument; no
+    request or backoff is started past ``deadline`` (a time.monotonic() value).
+    """
+    def time_left():
+        return deadline - time.monotonic()
+    
+    for attempt in range(UPDATE_RETRIES):
+        if attempt:
+            delay = update_retry_delay(attempt)
+            if time_left() - delay < MIN_REQUEST_SECONDS:
+                break
+            time.sleep(delay)
+        
+        if time_left() < MIN_REQUEST_SECONDS:
+            break
+        success, loaded = load(min(HTTP_TIMEOUT_SECONDS, time_left()))
+        if not success:
+            return False, loaded
+        data, sha = loaded
+        
+        if not apply(data):
+            return True, "Submission already counted"
+        
+        if time_left() < MIN_REQUEST_SECONDS:
+            break
+        success, message = save(data, sha, min(HTTP_TIMEOUT_SECONDS, time_left()))
+        if success or message != SAVE_CONFLICT:
+            return success, message
+        # Another submission updated the file first: reload and apply on top of it
+    
+    return False, "too many concurrent updates, gave up to show your results"
+
+def update_item_statistics(test_id, score_data, attempt_id, student_token, deadline):
+    """Fold a submission into the test's item statistics, retrying on concurrent writes"""
+    return update_file_with_retries(
+        lambda timeout: load_item_stats_from_github(test_id, student_token, timeout),
+        lambda stats: update_item_stats(stats, score_data, attempt_id),
+        lambda stats, sha, timeout: save_item_stats_to_github(stats, test_id, sha, student_token, timeout),
+        deadline
+    )
+
+def save_event_batch_to_github(attempt_id, batch_num, lines, student_token):
+    """Write one batch of proctoring events for an attempt to GitHub"""
+    try:
+        # Batch files are numbered, so a retried batch lands on the same path
+        url = f"https://api.github.com/repos/{GITHUB_REPO}/contents/{PROCTORING_PATH}/{attempt_id}/{batch_num:05d}.jsonl"
+        
+        data = {
+            "message": f"Add proctoring events: {attempt_id} batch {batch_num}",
+            "content": base64.b64encode(lines.encode()).decode(),
+            "branch": "main"
+        }
+        
+        headers = {
+            "Authorization": f"token {student_token}",
+            "Accept": "application/vnd.github.v3+json"
+        }
+        
+        response = get_http_session().put(url, json=data, headers=headers, timeout=HTTP_TIMEOUT_SECONDS)
         
         if response.status_code == 201:
-            return True, "Results successfully saved to GitHub"
+            return True, "Events saved to GitHub"
+        elif response.status_code == 422:
+            # The batch exists: it is ours only if an unacknowledged write stored these events
+            existing = get_http_session().get(url, headers=headers, timeout=HTTP_TIMEOUT_SECONDS)
+            if existing.status_code != 200:
+                return False, f"Error saving events: {response.status_code} - {response.text}"
+            if base64.b64decode(existing.json()['content']).decode() == lines:
+                return True, "Events already saved to GitHub"
+            return False, SAVE_CONFLICT
+        else:
+            return False, f"Error saving events: {response.status_code} - {response.text}"
+    
+    except Exception as e:
+        return False, f"Error saving events: {str(e)}"
+
+def flush_proctoring_events(force=False):
+    """Write buffered proctoring events in batches once a batch is full, or all on force"""
+    event_log = st.session_state.get('event_log')
+    if event_log is None:
+        return
+    student_token = st.session_state.student_info['student_token']
+    
+    # After a failed write flush_due waits before retrying, so an outage does not
+    # add a slow request to every rerun; a forced flush at submission always tries
+    while force or flush_due(event_log):
+        batch = pending_batch(event_log)
+        if batch is None:
+            break
+        batch_num, lines = batch
+        success, message = save_event_batch_to_github(event_log['attempt_id'], batch_num, lines, student_token)
+        if message == SAVE_CONFLICT:
+            # The batch number holds other events: write these under the next one
+            event_log['next_batch'] += 1
+            continue
+        if not success:
+            # Keep the events buffered and try again after the retry interval
+            mark_flush_failed(event_log)
+            break
+        mark_batch_written(event_log)
+
+def list_proctoring_batches_from_github(attempt_id, student_token):
+    """List an attempt's stored event batches in write order"""
+    try:
+        url = f"https://api.github.com/repos/{GITHUB_REPO}/contents/{PROCTORING_PATH}/{attempt_id}"
+        
+        headers = {
+            "Authorization": f"token {student_token}",
+            "Accept": "application/vnd.github.v3+json"
+        }
+        
+        response = get_http_session().get(url, headers=headers, timeout=HTTP_TIMEOUT_SECONDS)
+        
+        if response.status_code == 200:
+            return True, sorted(response.json(), key=lambda item: item['name'])
+        elif response.status_code == 404:
+            # No batch was ever written for this attempt
+            return True, []
         else:
-            return False, f"Error saving results: {response.status_code} - {response.text}"
+            return False, f"Error listing events: {response.status_code}"
     
     except Exception as e:
-        return False, f"Error saving results: {str(e)}"
+        return False, f"Error listing events: {str(e)}"
+
+def load_event_batch_from_github(batch_url, student_token):
+    """Load the JSON lines of one stored event batch"""
+    try:
+        headers = {
+            "Authorization": f"token {student_token}",
+            "Accept": "application/vnd.github.v3+json"
+        }
+        
+        response = get_http_session().get(batch_url, headers=headers, timeout=HTTP_TIMEOUT_SECONDS)
+        
+        if response.status_code == 200:
+            return True, base64.b64decode(response.json()['content']).decode()
+        else:
+            return False, f"Error loading events: {response.status_code}"
+    
+    except Exception as e:
+        return False, f"Error loading events: {str(e)}"
+
+def stream_proctoring_events_from_github(attempt_id, student_token):
+    """Return (success, events) where events yields an attempt's events batch by batch
+    
+    The stream raises IOError if a listed batch cannot be read part way through.
+    """
+    success, batches = list_proctoring_batches_from_github(attempt_id, student_token)
+    if not success:
+        return False, batches
+    
+    def events():
+        for entry in batches:
+            success, content = load_event_batch_from_github(entry['url'], student_token)
+            if not success:
+                raise IOError(content)
+            yield from iter_batch_events(content)
+    
+    return True, events()
+
+def store_submission(result_data, student_info, subject):
+    """Save a submission and, only once it is stored, update everything derived from it"""
+    success, message = save_student_result_to_github(
+        result_data, 
+        student_info['name'].replace(' ', '_'), 
+        student_info['test_id'],
+        student_info['student_token']
+    )
+    
+    if success:
+        st.success("✅ Results saved successfully!")
+    else:
+        st.warning(f"⚠️ Could not save results: {message}")
+        return
+    
+    # Write the remaining proctoring events
+    flush_proctoring_events(force=True)
+    
+    # Derived updates share one time budget so the student is not kept from their results
+    deadline = time.monotonic() + DERIVED_UPDATE_BUDGET_SECONDS
+    
+    # Update the running per-question statistics for this test
+    success, message = update_item_statistics(
+        student_info['test_id'], result_data['score'], result_data['attempt_id'], student_info['student_token'],
+        deadline
+    )
+    if not success:
+        st.warning(f"⚠️ Could not update question statistics: {message}")
+    
+    # Update the student's topic profile
+    success, message, st.session_state.diagnostic_report = update_student_diagnostics(
+        student_info, subject, result_data['score'], result_data['completed_at'],
+        result_data['attempt_id'], deadline
+    )
+    if not success:
+        st.warning(f"⚠️ Could not update your topic profile: {message}")
+
+def record_answer_change(option_key):
+    """Radio callback that logs an answer change for the current attempt"""
+    event_log = st.session_state.get('event_log')
+    if event_log is not None:
+        question_num = int(option_key.split('_')[1])
+        record_event(event_log, EVENT_ANSWER, question_num, st.session_state[option_key])
 
 def display_question(question, question_num, total_questions):
     """Display a single question with options"""
@@ -86,32 +535,50 @@ def display_question(question, question_num, total_questions):
         "Choose your answer:",
         options=list(question['options'].keys()),
         format_func=lambda x: f"{x}. {question['options'][x]}",
-        key=option_key
+        key=option_key,
+        on_change=record_answer_change,
+        args=(option_key,)
     )
     
     return selected_answer
 
 def calculate_score(questions, student_answers):
-    """Calculate score and generate results"""
+    """Calculate the score and the per-question answer vector"""
     total_questions = len(questions)
     correct_answers = 0
-    results = []
+    answers = []
     
     for i, question in enumerate(questions):
         question_num = i + 1
         student_answer = student_answers.get(f"q_{question_num}")
-        correct_answer = question['correct_answer']
-        is_correct = student_answer == correct_answer
+        is_correct = student_answer == question['correct_answer']
         
         if is_correct:
             correct_answers += 1
         
+        answers.append((student_answer, is_correct))
+    
+    score_percentage = (correct_answers / total_questions) * 100
+    
+    # Only answers are kept per session; question details are joined from the test when needed
+    return {
+        "total_questions": total_questions,
+        "correct_answers": correct_answers,
+        "score_percentage": score_percentage,
+        "answers": answers
+    }
+
+def detailed_results(questions, score_data):
+    """Join the answer vector with the test's questions into full per-question results"""
+    results = []
+    
+    for i, (question, (student_answer, is_correct)) in enumerate(zip(questions, score_data['answers'])):
         result = {
-            "question_number": question_num,
+            "question_number": i + 1,
             "question_text": question['question_text'],
-            "options": question['options'],
+            "options": dict(question['options']),
             "student_answer": student_answer,
-            "correct_answer": correct_answer,
+            "correct_answer": question['correct_answer'],
             "is_correct": is_correct,
             "explanation": question.get('explanation', 'No explanation provided'),
             "topic": question.get('topic', 'General'),
@@ -120,16 +587,42 @@ def calculate_score(questions, student_answers):
         }
         results.append(result)
     
-    score_percentage = (correct_answers / total_questions) * 100
-    
+    return results
+
+def detailed_score(questions, score_data):
+    """Score with full per-question results, as uploaded and used for diagnostics"""
     return {
-        "total_questions": total_questions,
-        "correct_answers": correct_answers,
-        "score_percentage": score_percentage,
-        "results": results
+        "total_questions": score_data['total_questions'],
+        "correct_answers": score_data['correct_answers'],
+        "score_percentage": score_data['score_percentage'],
+        "results": detailed_results(questions, score_data)
     }
 
-def display_results(score_data):
+def display_diagnostics(report):
+    """Display the weak-topics report built from the student's profile"""
+    st.header("🩺 Topic Diagnostics")
+    st.caption(f"Based on {report['attempts']} {report['subject']} submission(s) so far")
+    
+    if report['weak_topics']:
+        st.warning(f"📌 Topics to revise (mastery below {report['threshold']:.0f}%):")
+        for item in report['weak_topics']:
+            trend = f" ({item['trend']:+.1f} since last attempt)" if item['trend'] else ""
+            st.write(f"- **{item['topic']}**: {item['mastery']:.1f}% mastery, "
+                     f"{item['correct']}/{item['attempted']} correct overall{trend}")
+            if item['description']:
+                st.caption(item['description'])
+    else:
+        st.success("💪 No weak topics so far - great consistency!")
+    
+    if report['strong_topics']:
+        st.write("**Strong topics:** " + ", ".join(
+            f"{item['topic']} ({item['mastery']:.0f}%)" for item in report['strong_topics']
+        ))
+    
+    if report['untested_topics']:
+        st.write("**Not tested yet:** " + ", ".join(report['untested_topics']))
+
+def display_results(score_data, questions):
     """Display test results with explanations"""
     st.header("📊 Test Results")
     
@@ -153,7 +646,7 @@ def display_results(score_data):
     # Detailed results
     st.header("📋 Detailed Results")
     
-    for result in score_data['results']:
+    for result in detailed_results(questions, score_data):
         if result['is_correct']:
             st.success(f"✅ Question {result['question_number']}: Correct")
         else:
@@ -204,6 +697,12 @@ def main():
         st.session_state.test_started = False
     if 'start_time' not in st.session_state:
         st.session_state.start_time = None
+    if 'attempt_id' not in st.session_state:
+        st.session_state.attempt_id = None
+    if 'event_log' not in st.session_state:
+        st.session_state.event_log = None
+    if 'hall_holder' not in st.session_state:
+        st.session_state.hall_holder = None
     
     # Student information and test loading
     if not st.session_state.test_loaded:
@@ -215,7 +714,7 @@ def main():
                 student_name = st.text_input("Student Name*", help="Enter your full name")
                 email = st.text_input("Email (Optional)", help="Enter your email address")
             with col2:
-                student_id = st.text_input("Student ID (Optional)", help="Enter your student ID")
+                student_id = st.text_input("Student ID (Optional)", help="Enter your student ID to track your topic progress across tests")
                 test_id = st.text_input("Test ID*", help="Enter the Test ID provided by your teacher (e.g., AMIT_20250105_33)")
             
             # Student Token (GitHub Token)
@@ -233,7 +732,16 @@ def main():
                 else:
                     # Load test
                     with st.spinner("Loading test..."):
-                        success, test_data = load_test_from_github(test_id, student_token)
+                        if EXAM_HALL_MODE:
+                            st.session_state.hall_holder = uuid.uuid4().hex
+                            success, test_data = get_exam_registry().acquire(
+                                test_id,
+                                st.session_state.hall_holder,
+                                lambda: load_test_from_github(test_id, student_token),
+                                lambda: check_test_access(test_id, student_token)
+                            )
+                        else:
+                            success, test_data = load_test_from_github(test_id, student_token)
                         
                         if success:
                             st.session_state.test_loaded = True
@@ -302,6 +810,9 @@ def main():
             if st.button("▶️ Start Test", type="primary", help="Click to start the timed test"):
                 st.session_state.test_started = True
                 st.session_state.start_time = datetime.now()
+                st.session_state.attempt_id = uuid.uuid4().hex
+                st.session_state.event_log = new_event_log(st.session_state.attempt_id)
+                record_event(st.session_state.event_log, EVENT_START)
                 st.rerun()
         else:
             # Calculate remaining time
@@ -311,126 +822,12 @@ def main():
             
             # Timer display
             if remaining_time.total_seconds() > 0:
-                hours, remainder = divmod(int(remaining_time.total_seconds()), 3600)
-                minutes, seconds = divmod(remainder, 60)
-                
-                # Color coding for timer
-                if remaining_time.total_seconds() > 600:  # More than 10 minutes
-                    timer_color = "green"
-                    timer_bg = "#d4edda"
-                    timer_border = "#c3e6cb"
-                elif remaining_time.total_seconds() > 300:  # More than 5 minutes
-                    timer_color = "orange"
-                    timer_bg = "#fff3cd"
-                    timer_border = "#ffeaa7"
-                else:  # Less than 5 minutes
-                    timer_color = "red"
-                    timer_bg = "#f8d7da"
-                    timer_border = "#f5c6cb"
-                
                 # Sticky timer display with real-time auto-refresh
-                st.markdown(
-                    f"""
-                    <div class="timer-container" style="
-                        position: fixed;
-                        top: 100px;
-                        right: 20px;
-                        background-color: {timer_bg};
-                        border: 2px solid {timer_border};
-                        border-radius: 10px;
-                        padding: 15px;
-                        box-shadow: 0 4px 8px rgba(0,0,0,0.1);
-                        z-index: 999;
-                        font-family: 'Courier New', monospace;
-                        text-align: center;
-                        min-width: 150px;
-                    ">
-                        <div style="
-                            font-size: 14px;
-                            font-weight: bold;
-                            color: #333;
-                            margin-bottom: 5px;
-                        ">⏰ TIME LEFT</div>
-                        <div data-testid="timer-display" style="
-                            font-size: 24px;
-                            font-weight: bold;
-                            color: {timer_color};
-                            letter-spacing: 2px;
-                        ">{hours:02d}:{minutes:02d}:{seconds:02d}</div>
-                        <div style="
-                            font-size: 12px;
-                            color: #666;
-                            margin-top: 5px;
-                        ">Live Clock</div>
-                    </div>
-                    """,
-                    unsafe_allow_html=True
-                )
-                
-                # Add a JavaScript timer that updates only the timer display
-                st.markdown(
-                    f"""
-                    <script>
-                    // Update timer every second without refreshing the page
-                    (function() {{
-                        let startTime = new Date().getTime();
-                        let examDuration = {exam_duration_minutes} * 60 * 1000; // Convert to milliseconds
-                        let timeRemaining = {int(remaining_time.total_seconds() * 1000)}; // Current remaining time in ms
-                        
-                        function updateTimer() {{
-                            if (timeRemaining <= 0) {{
-                                // Time's up - reload to trigger auto-submit
-                                window.location.reload();
-                                return;
-                            }}
-                            
-                            let hours = Math.floor(timeRemaining / (1000 * 60 * 60));
-                            let minutes = Math.floor((timeRemaining % (1000 * 60 * 60)) / (1000 * 60));
-                            let seconds = Math.floor((timeRemaining % (1000 * 60)) / 1000);
-                            
-                            let timeString = String(hours).padStart(2, '0') + ':' + 
-                                           String(minutes).padStart(2, '0') + ':' + 
-                                           String(seconds).padStart(2, '0');
-                            
-                            // Find timer elements and update them
-                            let timerElements = document.querySelectorAll('[data-testid="timer-display"]');
-                            timerElements.forEach(function(element) {{
-                                if (element) {{
-                                    element.textContent = timeString;
-                                    
-                                    // Update colors based on time remaining
-                                    let container = element.closest('.timer-container');
-                                    if (container) {{
-                                        if (timeRemaining > 600000) {{ // More than 10 minutes
-                                            element.style.color = 'green';
-                                            container.style.backgroundColor = '#d4edda';
-                                            container.style.borderColor = '#c3e6cb';
-                                        }} else if (timeRemaining > 300000) {{ // More than 5 minutes
-                                            element.style.color = 'orange';
-                                            container.style.backgroundColor = '#fff3cd';
-                                            container.style.borderColor = '#ffeaa7';
-                                        }} else {{ // Less than 5 minutes
-                                            element.style.color = 'red';
-                                            container.style.backgroundColor = '#f8d7da';
-                                            container.style.borderColor = '#f5c6cb';
-                                        }}
-                                    }}
-                                }}
-                            }});
-                            
-                            timeRemaining -= 1000; // Subtract 1 second
-                        }}
-                        
-                        // Update immediately
-                        updateTimer();
-                        
-                        // Update every second
-                        setInterval(updateTimer, 1000);
-                    }})();
-                    </script>
-                    """,
-                    unsafe_allow_html=True
+                timer_html, timer_script = render_timer(
+                    remaining_time.total_seconds(), exam_duration_minutes
                 )
+                st.markdown(timer_html, unsafe_allow_html=True)
+                st.markdown(timer_script, unsafe_allow_html=True)
                 
                 # Special warning for final minute
                 if remaining_time.total_seconds() <= 60:
@@ -441,6 +838,7 @@ def main():
             else:
                 # Time's up - auto submit
                 st.error("⏰ Time's up! Submitting your test automatically...")
+                record_event(st.session_state.event_log, EVENT_TIMEOUT)
                 
                 # Get current answers
                 questions = test_data['questions']
@@ -459,6 +857,7 @@ def main():
                 
                 # Create result data
                 result_data = {
+                    "attempt_id": st.session_state.attempt_id,
                     "student_name": student_info['name'],
                     "student_email": student_info['email'],
                     "student_id": student_info['student_id'],
@@ -475,24 +874,18 @@ def main():
                     "completed_at": datetime.now().isoformat(),
                     "time_taken_minutes": exam_duration_minutes,
                     "auto_submitted": True,
-                    "score": score_data
+                    "score": detailed_score(questions, score_data),
+                    "proctoring": event_buffer_counts(st.session_state.event_log)
                 }
+                result_data["content_hash"] = submission_hash(result_data)
                 
-                # Save results to GitHub
-                success, message = save_student_result_to_github(
-                    result_data, 
-                    student_info['name'].replace(' ', '_'), 
-                    student_info['test_id'],
-                    student_info['student_token']
-                )
-                
-                if success:
-                    st.success("✅ Results saved successfully!")
-                else:
-                    st.warning(f"⚠️ Could not save results: {message}")
+                # Save results and the data derived from them
+                store_submission(result_data, student_info, test_data['subject'])
                 
                 # Store results in session state
                 st.session_state.test_completed = True
+                if EXAM_HALL_MODE:
+                    get_exam_registry().release(student_info['test_id'], st.session_state.hall_holder)
                 st.session_state.score_data = score_data
                 st.rerun()
             
@@ -509,11 +902,16 @@ def main():
                     student_answers[f"q_{question_num}"] = selected_answer
                 st.markdown("---")
             
+            # Write any full batch of proctoring events
+            flush_proctoring_events()
+            
             # Finish test button
             if st.button("🏁 Finish Test", type="primary"):
                 if len(student_answers) < len(questions):
                     st.warning("⚠️ Please answer all questions before finishing the test.")
                 else:
+                    record_event(st.session_state.event_log, EVENT_SUBMIT)
+                    
                     # Calculate actual time taken
                     time_taken = datetime.now() - st.session_state.start_time
                     time_taken_minutes = int(time_taken.total_seconds() / 60)
@@ -523,6 +921,7 @@ def main():
                     
                     # Create result data
                     result_data = {
+                        "attempt_id": st.session_state.attempt_id,
                         "student_name": student_info['name'],
                         "student_email": student_info['email'],
                         "student_id": student_info['student_id'],
@@ -539,30 +938,26 @@ def main():
                         "completed_at": datetime.now().isoformat(),
                         "time_taken_minutes": time_taken_minutes,
                         "auto_submitted": False,
-                        "score": score_data
+                        "score": detailed_score(questions, score_data),
+                        "proctoring": event_buffer_counts(st.session_state.event_log)
                     }
+                    result_data["content_hash"] = submission_hash(result_data)
                     
-                    # Save results to GitHub
-                    success, message = save_student_result_to_github(
-                        result_data, 
-                        student_info['name'].replace(' ', '_'), 
-                        student_info['test_id'],
-                        student_info['student_token']
-                    )
-                    
-                    if success:
-                        st.success("✅ Results saved successfully!")
-                    else:
-                        st.warning(f"⚠️ Could not save results: {message}")
+                    # Save results and the data derived from them
+                    store_submission(result_data, student_info, test_data['subject'])
                     
                     # Store results in session state
                     st.session_state.test_completed = True
+                    if EXAM_HALL_MODE:
+                        get_exam_registry().release(student_info['test_id'], st.session_state.hall_holder)
                     st.session_state.score_data = score_data
                     st.rerun()
     
     # Display results
     elif st.session_state.test_completed:
-        display_results(st.session_state.score_data)
+        display_results(st.session_state.score_data, st.session_state.test_data['questions'])
+        if st.session_state.get('diagnostic_report'):
+            display_diagnostics(st.session_state.diagnostic_report)
         
         # Reset test
         if st.button("🔄 Take Another Test"):
@@ -572,52 +967,15 @@ def main():
             st.session_state.test_completed = False
             st.session_state.test_started = False
             st.session_state.start_time = None
+            st.session_state.attempt_id = None
+            st.session_state.event_log = None
+            st.session_state.hall_holder = None
+            st.session_state.diagnostic_report = None
             st.rerun()
     
     # Information section
     with st.expander("ℹ️ How to take the test"):
-        st.markdown("""
-        ### Steps to take the test:
-        1. **Enter Information**: Fill in your name and Test ID (email and student ID are optional)
-        2. **Student Token**: Enter your GitHub Personal Access Token
-        3. **Load Test**: Click "Load Test" to fetch the test questions
-        4. **Start Test**: Click "Start Test" to begin the timed exam
-        5. **Answer Questions**: Read each question carefully and select your answer
-        6. **Monitor Time**: Keep an eye on the countdown timer at the top
-        7. **Complete Test**: Click "Finish Test" when done or time will auto-submit
-        8. **View Results**: Get your score and detailed explanations
-        
-        ### Timer Features:
-        - ⏰ **Countdown Timer**: Shows exact time remaining in HH:MM:SS format
-        - 📍 **Sticky Timer**: Fixed timer on right side that stays visible while scrolling
-        - 🟢 **Green Timer**: More than 10 minutes remaining
-        - 🟡 **Orange Timer**: 5-10 minutes remaining  
-        - 🔴 **Red Timer**: Less than 5 minutes remaining
-        - 🔄 **Real-time Updates**: Timer updates every second automatically
-        - ⚡ **Auto-Submit**: Test submits automatically when time expires
-        
-        ### Test ID Format:
-        - Test IDs follow the format: `TEACHERNAME_YYYYMMDD_XX`
-        - Example: `AMIT_20250105_33`
-        - Get this from your teacher
-        
-        ### Important Notes:
-        - ⚠️ **Timer cannot be paused** once you start the test
-        - Make sure you have a stable internet connection
-        - Answer all questions before time runs out
-        - Your progress is automatically saved
-        - Results are automatically saved to GitHub
-        - The test shows teacher name, duration, and creation date
-        
-        ### Features:
-        - ✅ Interactive test interface with timer
-        - ✅ Teacher and test information display
-        - ✅ Real-time countdown timer with color coding
-        - ✅ Automatic submission when time expires
-        - ✅ Instant scoring and feedback
-        - ✅ Detailed explanations for each answer
-        - ✅ Results saved to GitHub with time tracking
-        """)
+        st.markdown(HOW_TO_TAKE_TEST_MD)
 
 if __name__ == "__main__":
     main() 
@@ -0,0 +1,180 @@
+from string import Template
+
+# Static page assets for the student app: the sticky timer and the help text.
+# They are kept out of student_app.py for readability only; rendering costs the
+# same as the inline f-strings they replace.
+
+# Timer colors as (text color, background, border), from most to least time left
+TIMER_STYLES = (
+    (600, ("green", "#d4edda", "#c3e6cb")),  # More than 10 minutes
+    (300, ("orange", "#fff3cd", "#ffeaa7")),  # More than 5 minutes
+    (0, ("red", "#f8d7da", "#f5c6cb")),  # Less than 5 minutes
+)
+
+# Sticky timer display
+TIMER_HTML = Template("""
+<div class="timer-container" style="
+    position: fixed;
+    top: 100px;
+    right: 20px;
+    background-color: $timer_bg;
+    border: 2px solid $timer_border;
+    border-radius: 10px;
+    padding: 15px;
+    box-shadow: 0 4px 8px rgba(0,0,0,0.1);
+    z-index: 999;
+    font-family: 'Courier New', monospace;
+    text-align: center;
+    min-width: 150px;
+">
+    <div style="
+        font-size: 14px;
+        font-weight: bold;
+        color: #333;
+        margin-bottom: 5px;
+    ">⏰ TIME LEFT</div>
+    <div data-testid="timer-display" style="
+        font-size: 24px;
+        font-weight: bold;
+        color: $timer_color;
+        letter-spacing: 2px;
+    ">$clock</div>
+    <div style="
+        font-size: 12px;
+        color: #666;
+        margin-top: 5px;
+    ">Live Clock</div>
+</div>
+""")
+
+# JavaScript timer that updates only the timer display
+TIMER_SCRIPT = Template("""
+<script>
+// Update timer every second without refreshing the page
+(function() {
+    let startTime = new Date().getTime();
+    let examDuration = $exam_duration_minutes * 60 * 1000; // Convert to milliseconds
+    let timeRemaining = $remaining_ms; // Current remaining time in ms
+
+    function updateTimer() {
+        if (timeRemaining <= 0) {
+            // Time's up - reload to trigger auto-submit
+            window.location.reload();
+            return;
+        }
+
+        let hours = Math.floor(timeRemaining / (1000 * 60 * 60));
+        let minutes = Math.floor((timeRemaining % (1000 * 60 * 60)) / (1000 * 60));
+        let seconds = Math.floor((timeRemaining % (1000 * 60)) / 1000);
+
+        let timeString = String(hours).padStart(2, '0') + ':' + 
+                       String(minutes).padStart(2, '0') + ':' + 
+                       String(seconds).padStart(2, '0');
+
+        // Find timer elements and update them
+        let timerElements = document.querySelectorAll('[data-testid="timer-display"]');
+        timerElements.forEach(function(element) {
+            if (element) {
+                element.textContent = timeString;
+
+                // Update colors based on time remaining
+                let container = element.closest('.timer-container');
+                if (container) {
+                    if (timeRemaining > 600000) { // More than 10 minutes
+                        element.style.color = 'green';
+                        container.style.backgroundColor = '#d4edda';
+                        container.style.borderColor = '#c3e6cb';
+                    } else if (timeRemaining > 300000) { // More than 5 minutes
+                        element.style.color = 'orange';
+                        container.style.backgroundColor = '#fff3cd';
+                        container.style.borderColor = '#ffeaa7';
+                    } else { // Less than 5 minutes
+                        element.style.color = 'red';
+                        container.style.backgroundColor = '#f8d7da';
+                        container.style.borderColor = '#f5c6cb';
+                    }
+                }
+            }
+        });
+
+        timeRemaining -= 1000; // Subtract 1 second
+    }
+
+    // Update immediately
+    updateTimer();
+
+    // Update every second
+    setInterval(updateTimer, 1000);
+})();
+</script>
+""")
+
+HOW_TO_TAKE_TEST_MD = """
+### Steps to take the test:
+1. **Enter Information**: Fill in your name and Test ID (email and student ID are optional)
+2. **Student Token**: Enter your GitHub Personal Access Token
+3. **Load Test**: Click "Load Test" to fetch the test questions
+4. **Start Test**: Click "Start Test" to begin the timed exam
+5. **Answer Questions**: Read each question carefully and select your answer
+6. **Monitor Time**: Keep an eye on the countdown timer at the top
+7. **Complete Test**: Click "Finish Test" when done or time will auto-submit
+8. **View Results**: Get your score and detailed explanations
+
+### Timer Features:
+- ⏰ **Countdown Timer**: Shows exact time remaining in HH:MM:SS format
+- 📍 **Sticky Timer**: Fixed timer on right side that stays visible while scrolling
+- 🟢 **Green Timer**: More than 10 minutes remaining
+- 🟡 **Orange Timer**: 5-10 minutes remaining  
+- 🔴 **Red Timer**: Less than 5 minutes remaining
+- 🔄 **Real-time Updates**: Timer updates every second automatically
+- ⚡ **Auto-Submit**: Test submits automatically when time expires
+
+### Test ID Format:
+- Test IDs follow the format: `TEACHERNAME_YYYYMMDD_XX`
+- Example: `AMIT_20250105_33`
+- Get this from your teacher
+
+### Important Notes:
+- ⚠️ **Timer cannot be paused** once you start the test
+- Make sure you have a stable internet connection
+- Answer all questions before time runs out
+- Your progress is automatically saved
+- Results are automatically saved to GitHub
+- The test shows teacher name, duration, and creation date
+
+### Features:
+- ✅ Interactive test interface with timer
+- ✅ Teacher and test information display
+- ✅ Real-time countdown timer with color coding
+- ✅ Automatic submission when time expires
+- ✅ Instant scoring and feedback
+- ✅ Detailed explanations for each answer
+- ✅ Results saved to GitHub with time tracking
+"""
+
+
+def timer_style(remaining_seconds):
+    """Pick the timer colors for the remaining time"""
+    for threshold, style in TIMER_STYLES:
+        if remaining_seconds > threshold:
+            return style
+    return TIMER_STYLES[-1][1]
+
+
+def render_timer(remaining_seconds, exam_duration_minutes):
+    """Render the sticky timer markup and its update script"""
+    hours, remainder = divmod(int(remaining_seconds), 3600)
+    minutes, seconds = divmod(remainder, 60)
+    timer_color, timer_bg, timer_border = timer_style(remaining_seconds)
+    
+    html = TIMER_HTML.substitute(
+        timer_color=timer_color,
+        timer_bg=timer_bg,
+        timer_border=timer_border,
+        clock=f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+    )
+    script = TIMER_SCRIPT.substitute(
+        exam_duration_minutes=exam_duration_minutes,
+        remaining_ms=int(remaining_seconds * 1000)
+    )
+    return html, script
@@ -0,0 +1,39 @@
+from diagnostics import new_profile, update_profile, upgrade_profile, weak_topics_report
+
+
+def submission(topic, correct, attempted):
+    return {"results": [{"topic": topic, "is_correct": i < correct} for i in range(attempted)]}
+
+
+def test_failing_attempt_outweighs_one_lucky_answer():
+    profile = new_profile("S1")
+    update_profile(profile, "Physics", submission("Optics", 1, 1), attempt_id="a")
+    report = weak_topics_report(profile, "Physics")
+    assert [item['topic'] for item in report['weak_topics']] == ["Optics"]
+
+    update_profile(profile, "Physics", submission("Optics", 0, 10), attempt_id="b")
+    report = weak_topics_report(profile, "Physics")
+    assert report['strong_topics'] == []
+    assert report['weak_topics'][0]['mastery'] < 10
+
+
+def test_attempts_are_counted_per_subject():
+    profile = new_profile("S1")
+    update_profile(profile, "Physics", submission("Optics", 3, 4), attempt_id="a")
+    update_profile(profile, "Physics", submission("Optics", 4, 4), attempt_id="b")
+    update_profile(profile, "Mathematics", submission("Trigonometry", 2, 4), attempt_id="c")
+
+    assert weak_topics_report(profile, "Physics")['attempts'] == 2
+    assert weak_topics_report(profile, "Mathematics")['attempts'] == 1
+
+
+def test_version_1_profile_is_upgraded():
+    profile = {
+        "version": 1, "student": "S1", "attempts": 3, "updated_at": None, "recent_attempts": [],
+        "subjects": {"Physics": {"Optics": [8, 6, 75.0, [50.0, 100.0], None]}}
+    }
+    upgrade_profile(profile)
+    assert profile["subjects"]["Physics"] == {
+        "attempts": 2, "topics": {"Optics": [8, 6, 75.0, [50.0, 100.0], None]}
+    }
+    assert weak_topics_report(profile, "Physics")['attempts'] == 2
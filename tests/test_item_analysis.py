@@ -0,0 +1,64 @@
+import random
+
+from item_analysis import item_report, new_item_stats, reusable_questions, update_item_stats
+
+
+def simulate(stats, students=200, questions=5, inverted=5, seed=7):
+    """Feed simulated submissions where one question favours low-ability students"""
+    rng = random.Random(seed)
+    for attempt in range(students):
+        ability = rng.random()
+        results = []
+        for question_num in range(1, questions + 1):
+            chance = 1 - ability if question_num == inverted else ability
+            is_correct = rng.random() < chance
+            results.append({
+                "question_number": question_num,
+                "student_answer": "A" if is_correct else "B",
+                "is_correct": is_correct
+            })
+        correct_answers = sum(result['is_correct'] for result in results)
+        score_data = {
+            "total_questions": questions,
+            "correct_answers": correct_answers,
+            "score_percentage": correct_answers / questions * 100,
+            "results": results
+        }
+        update_item_stats(stats, score_data, attempt_id=str(attempt))
+
+
+def test_inverted_item_is_flagged():
+    stats = new_item_stats("T")
+    simulate(stats)
+
+    report = {item['question_number']: item for item in item_report(stats)}
+    assert report[5]['point_biserial'] < 0
+    assert "negative_discrimination" in report[5]['flags']
+    for question_num in range(1, 5):
+        assert report[question_num]['point_biserial'] > 0
+        assert "negative_discrimination" not in report[question_num]['flags']
+
+
+def test_reusable_questions_drop_flagged_items():
+    stats = new_item_stats("T")
+    simulate(stats)
+
+    questions = [{"question_number": n} for n in range(1, 6)]
+    assert [q['question_number'] for q in reusable_questions(questions, stats)] == [1, 2, 3, 4]
+
+
+def test_resubmitted_attempt_is_counted_once():
+    stats = new_item_stats("T")
+    score_data = {
+        "total_questions": 2,
+        "correct_answers": 1,
+        "score_percentage": 50.0,
+        "results": [
+            {"question_number": 1, "student_answer": "A", "is_correct": True},
+            {"question_number": 2, "student_answer": None, "is_correct": False}
+        ]
+    }
+    assert update_item_stats(stats, score_data, attempt_id="a")
+    assert not update_item_stats(stats, score_data, attempt_id="a")
+    assert stats["submissions"] == 1
+    assert stats["items"]["2"][-1] == {"-": 1}
@@ -0,0 +1,30 @@
+from proctoring import (
+    EVENT_ANSWER, FLUSH_BATCH_SIZE, FLUSH_RETRY_SECONDS,
+    flush_due, mark_batch_written, mark_flush_failed, new_event_log, record_event
+)
+
+
+def full_event_log():
+    event_log = new_event_log("a1")
+    for i in range(FLUSH_BATCH_SIZE):
+        record_event(event_log, EVENT_ANSWER, 1, "A")
+    return event_log
+
+
+def test_failed_flush_backs_off_routine_flushes():
+    event_log = full_event_log()
+    assert flush_due(event_log, now=1000)
+
+    mark_flush_failed(event_log, now=1000)
+    assert not flush_due(event_log, now=1000 + FLUSH_RETRY_SECONDS - 1)
+    assert flush_due(event_log, now=1000 + FLUSH_RETRY_SECONDS)
+
+
+def test_written_batch_clears_the_failure():
+    event_log = full_event_log()
+    mark_flush_failed(event_log, now=1000)
+    mark_batch_written(event_log)
+    for i in range(FLUSH_BATCH_SIZE):
+        record_event(event_log, EVENT_ANSWER, 2, "B")
+
+    assert flush_due(event_log, now=1001)